@@ -97,31 +97,46 @@ def eos_gamma_law_react(gamma, q, Cv, t_i, eos_inert):
 
 def eos_polytrope_law(gamma, gamma_th, rho_transition, k):
 
+    # The scalar branches are what the root finds and State use, so they stay
+    # plain Python; arrays (eg when evaluating a rarefaction for plotting)
+    # go through numpy.where instead
+    def p_eps_cold(rho):
+        if not isinstance(rho, numpy.ndarray):
+            if (rho < rho_transition):
+                p_cold = k[0] * rho**gamma[0]
+                eps_cold = p_cold / rho / (gamma[0] - 1.0)
+            else:
+                p_cold = k[1] * rho**gamma[1]
+                eps_cold = p_cold / rho / (gamma[1] - 1.0) - \
+                    k[1] * rho_transition**(gamma[1] - 1.0) + \
+                    k[0] * rho_transition**(gamma[0] - 1.0)
+            return p_cold, eps_cold
+        p_cold = numpy.where(rho < rho_transition,
+                             k[0] * rho**gamma[0],
+                             k[1] * rho**gamma[1])
+        eps_cold = numpy.where(rho < rho_transition,
+            p_cold / rho / (gamma[0] - 1.0),
+            p_cold / rho / (gamma[1] - 1.0) -
+            k[1] * rho_transition**(gamma[1] - 1.0) +
+            k[0] * rho_transition**(gamma[0] - 1.0))
+        return p_cold, eps_cold
+
+    def positive_part(x):
+        if isinstance(x, numpy.ndarray):
+            return numpy.maximum(0.0, x)
+        return max(0.0, x)
+
     def p_from_rho_eps(rho, eps):
-        if (rho < rho_transition):
-            p_cold = k[0] * rho**gamma[0]
-            eps_cold = p_cold / rho / (gamma[0] - 1.)
-        else:
-            p_cold = k[1] * rho**gamma[1]
-            eps_cold = p_cold / rho / (gamma[1] - 1.) - \
-                k[1] * rho_transition**(gamma[1] - 1.) + \
-                k[0] * rho_transition**(gamma[0] - 1.)
+        p_cold, eps_cold = p_eps_cold(rho)
 
-        p_th = max(0.0, (gamma_th - 1.0) * rho * (eps - eps_cold))
+        p_th = positive_part((gamma_th - 1.0) * rho * (eps - eps_cold))
 
         return p_cold + p_th
 
     def h_from_rho_eps(rho, eps):
-        if (rho < rho_transition):
-            p_cold = k[0] * rho**gamma[0]
-            eps_cold = p_cold / rho / (gamma[0] - 1.0)
-        else:
-            p_cold = k[1] * rho**gamma[1]
-            eps_cold = p_cold / rho / (gamma[1] - 1.0) - \
-                k[1] * rho_transition**(gamma[1] - 1.0) + \
-                k[0] * rho_transition**(gamma[0] - 1.0)
+        p_cold, eps_cold = p_eps_cold(rho)
 
-        p_th = max(0., (gamma_th - 1.) * rho * (eps - eps_cold))
+        p_th = positive_part((gamma_th - 1.) * rho * (eps - eps_cold))
 
         return 1. + eps_cold + eps + (p_cold + p_th)/ rho
 
@@ -130,16 +145,9 @@ def eos_polytrope_law(gamma, gamma_th, rho_transition, k):
 
     # TODO: fix
     def h_from_rho_p(rho, p):
-        if (rho < rho_transition):
-            p_cold = k[0] * rho**gamma[0]
-            eps_cold = p_cold / rho / (gamma[0] - 1.0)
-        else:
-            p_cold = k[1] * rho**gamma[1]
-            eps_cold = p_cold / rho / (gamma[1] - 1.0) - \
-                k[1] * rho_transition**(gamma[1] - 1.0) + \
-                k[0] * rho_transition**(gamma[0] - 1.0)
+        p_cold, eps_cold = p_eps_cold(rho)
 
-        p_th = max(0.0, p - p_cold)
+        p_th = positive_part(p - p_cold)
         eps = p_th / (gamma_th - 1.0) / rho + eps_cold
 
         return 1.0 + eps_cold + eps + p / rho
@@ -35,6 +35,10 @@ class RiemannProblem(object):
     state_r : State
         Initial State (variables and equation of state) to the right of the
         interface
+    rtol, atol : scalar, optional
+        Tolerances for integrating across any Rarefaction
+    n_points : int, optional
+        Number of points kept across any Rarefaction for plotting
 
     Attributes
     ----------
@@ -57,7 +61,8 @@ class RiemannProblem(object):
         The pressure in the star States.
     """
 
-    def __init__(self, state_l, state_r):
+    def __init__(self, state_l, state_r, rtol=1e-12, atol=1e-10,
+                 n_points=500):
 
         # Cache for plot
         self._png_data = None
@@ -66,11 +71,13 @@ class RiemannProblem(object):
         self.state_l = state_l
         self.state_r = state_r
 
+        options = {'rtol' : rtol, 'atol' : atol, 'n_points' : n_points}
+
         def find_delta_v(p_star_guess):
 
             try:
-                wave_l = Wave(self.state_l, p_star_guess, 0)
-                wave_r = Wave(self.state_r, p_star_guess, 2)
+                wave_l = Wave(self.state_l, p_star_guess, 0, **options)
+                wave_r = Wave(self.state_r, p_star_guess, 2, **options)
             except UnphysicalSolution:
                 return 1
 
@@ -94,8 +101,8 @@ class RiemannProblem(object):
             pmax_rootfind = pmax
 
         self.p_star = brentq(find_delta_v, pmin_rootfind, pmax_rootfind)
-        wave_l = Wave(self.state_l, self.p_star, 0)
-        wave_r = Wave(self.state_r, self.p_star, 2)
+        wave_l = Wave(self.state_l, self.p_star, 0, **options)
+        wave_r = Wave(self.state_r, self.p_star, 2, **options)
         self.state_star_l = wave_l.q_r
         self.state_star_r = wave_r.q_l
         try:
@@ -126,14 +133,16 @@ class RiemannProblem(object):
         ax.set_title("Characteristics")
         names = [r"$\rho$", r"$v$", r"$v_t$", r"$\epsilon$", r"$p$", r"$W$",
                  r"$h$", r"$c_s$"]
-        xi = [-1.05]
-        data = self.state_l.state()
+        xi = [[-1.05]]
+        data = [self.state_l.state()]
         for wave in self.waves:
             xi_wave, data_wave = wave.plotting_data()
-            xi = numpy.hstack((xi, xi_wave))
-            data = numpy.vstack((data, data_wave))
-        xi = numpy.hstack((xi, [1.05]))
-        data = numpy.vstack((data, self.state_r.state()))
+            xi.append(xi_wave)
+            data.append(data_wave)
+        xi.append([1.05])
+        data.append(self.state_r.state())
+        xi = numpy.concatenate(xi)
+        data = numpy.vstack(data)
         for ax_j in range(3):
             for ax_i in range(3):
                 if ax_i == 0 and ax_j == 0:
@@ -10,6 +10,35 @@ The fluid State (key variables plus equation of state) at a point.
 """
 from __future__ import division
 import numpy
+from copy import copy
+
+
+def wavespeed_from_v_cs(v, vt, cs, wavenumber):
+    r"""
+    Compute the characteristic speed from the velocities and sound speed.
+
+    Parameters
+    ----------
+
+    v : scalar
+        Velocity component in the normal (:math:`x`) direction :math:`v_x`
+    vt : scalar
+        Velocity component tangential to :math:`x` :math:`v_t`
+    cs : scalar
+        Speed of sound :math:`c_s`
+    wavenumber: scalar
+        Wave number ([0,1,2]).
+    """
+    if wavenumber == 1:
+        return v
+    elif abs(wavenumber - 1) == 1:
+        s = wavenumber - 1
+        term1 = v * (1.0 - cs**2)
+        term2 = (1.0 - v**2 - vt**2) * (1.0 - v**2 - vt**2 * cs**2)
+        term3 = 1.0 - (v**2 + vt**2) * cs**2
+        return (term1 + s * cs * numpy.sqrt(term2)) / term3
+    else:
+        raise NotImplementedError("wavenumber must be 0, 1, 2")
 
 
 class State(object):
@@ -34,6 +63,11 @@ class State(object):
         Label for output purposes.
     """
 
+    # States are created inside the root finds, so avoid a per-instance
+    # __dict__
+    __slots__ = ('rho', 'v', 'vt', 'eps', 'eos', 'q', 'W_lorentz', 'p', 'h',
+                 'cs', 'label', '_wavespeeds')
+
     def __init__(self, rho, v, vt, eps, eos, label=None):
 
         self.rho = rho
@@ -50,6 +84,19 @@ class State(object):
         self.h = self.eos['h_from_rho_eps'](rho, eps)
         self.cs = self.eos['cs_from_rho_eps'](rho, eps)
         self.label = label
+        # Filled in by wavespeed as each wave number is requested
+        self._wavespeeds = {}
+
+    def clone(self):
+        """
+        Return a copy of the State.
+
+        The variables are scalars, so a shallow copy is enough; the equation
+        of state is shared rather than copied.
+        """
+        q = copy(self)
+        q._wavespeeds = dict(self._wavespeeds)
+        return q
 
     def prim(self):
         r"""
@@ -69,23 +116,20 @@ class State(object):
         Compute the wavespeed given the wave number (0 for the left wave,
         2 for the right wave).
 
+        The wavespeed is queried several times per state while building the
+        waves, so it is computed once per wave number and cached. The cache
+        assumes that v, vt and cs are not changed after the first query.
+
         Parameters
         ----------
 
         wavenumber: scalar
             Wave number ([0,1,2]).
         """
-        if wavenumber == 1:
-            return self.v
-        elif abs(wavenumber - 1) == 1:
-            s = wavenumber - 1
-            term1 = self.v * (1.0 - self.cs**2)
-            term2 = (1.0 - self.v**2 - self.vt**2) * (1.0 - self.v**2 -
-                     self.vt**2 * self.cs**2)
-            term3 = 1.0 - (self.v**2 + self.vt**2) * self.cs**2
-            return (term1 + s * self.cs * numpy.sqrt(term2)) / term3
-        else:
-            raise NotImplementedError("wavenumber must be 0, 1, 2")
+        if wavenumber not in self._wavespeeds:
+            self._wavespeeds[wavenumber] = wavespeed_from_v_cs(
+                self.v, self.vt, self.cs, wavenumber)
+        return self._wavespeeds[wavenumber]
 
     def vt_from_known(self, rho, v, eps):
         r"""
@@ -31,13 +31,13 @@ def _rarefaction(ps, q_start, lr_sign):
         right-going
     """
     vs = numpy.zeros_like(ps)
+    dwdp = wave.rarefaction_dwdp_function(q_start, lr_sign+1)
     for i, p in enumerate(ps):
-        w_all = odeint(wave.rarefaction_dwdp,
+        w_all = odeint(dwdp,
                        numpy.array([q_start.rho, q_start.v,
                        q_start.eps]),
                        [q_start.p, p], rtol = 1e-12,
-                       atol = 1e-10,
-                       args=((q_start, lr_sign+1)))
+                       atol = 1e-10)
         vs[i] = w_all[-1, 1]
     return vs
 
@@ -133,7 +133,7 @@ def _detonation(ps, q_start, lr_sign):
             # The single detonation is unphysical - must be unstable weak
             # detonation. So skip the calculation and make sure the CJ
             # calculation runs
-            q_unknown = deepcopy(q_start)
+            q_unknown = q_start.clone()
             v_detonation = q_unknown.wavespeed(lr_sign+1) + 1
         else:
             v_detonation, q_unknown = wave.post_discontinuity_state(p, q_start,
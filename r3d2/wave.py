@@ -10,18 +10,123 @@ Core functions and classes that solve across a wave, or wave section.
 """
 from __future__ import division
 import numpy
-from scipy.optimize import brentq
+from scipy.optimize import brenth
 from scipy.integrate import odeint
-from copy import deepcopy
-from .state import State
+from .state import State, wavespeed_from_v_cs
 
-def rarefaction_dwdp(w, p, q_known, wavenumber):
+def _isclose(a, b, rtol=1e-5, atol=1e-8):
+    """
+    Scalar equivalent of numpy.allclose, avoiding its array overhead.
+
+    Parameters
+    ----------
+
+    a, b : scalar
+        Values to compare
+    rtol : scalar, optional
+        Relative tolerance (relative to b)
+    atol : scalar, optional
+        Absolute tolerance
+    """
+    return abs(a - b) <= atol + rtol * abs(b)
+
+def _memoize_root(residual, *args):
+    """
+    Wrap a residual function of one scalar so repeated points are not
+    recomputed.
+
+    The root finds here first evaluate the residual at the ends of the
+    bracket to check it, and the root finder then evaluates the same end
+    points again. Each evaluation builds a wave section, so it is worth
+    caching.
+
+    Parameters
+    ----------
+
+    residual : function
+        Residual, called as residual(x, *args)
+    args : tuple
+        Fixed additional arguments to the residual
+
+    Returns
+    -------
+
+    f : function
+        Residual as a function of x alone
+    """
+    values = {}
+
+    def f(x):
+        if x not in values:
+            values[x] = residual(x, *args)
+        return values[x]
+
+    return f
+
+def rarefaction_dwdp_function(q_known, wavenumber):
     r"""
+    Build the right hand side of the rarefaction ODE for a given known state
+    and wave.
+
+    Everything that does not depend on the point in the rarefaction (the
+    equation of state functions, the invariant :math:`h W v_t` of the known
+    state and the direction of the wave) is fixed here, once, rather than on
+    every call made by the integrator.
+
     There is a tricky point here that needs investigation. If
-    the input p is used here, rather than local_state.p, then they
-    can diverge (when :math:`v_t` is significant) leading to overflows of g. By
-    using local_state we avoid the overflow, but it may mean the final
-    state is not very accurate.
+    the input p is used here, rather than the local pressure computed from
+    w, then they can diverge (when :math:`v_t` is significant) leading to
+    overflows of g. By using the local pressure we avoid the overflow, but it
+    may mean the final state is not very accurate.
+
+    Parameters
+    ----------
+
+    q_known : State
+        Known state
+    wavenumber : scalar
+        Wave number
+
+    Returns
+    -------
+
+    dwdp : function
+        Right hand side as a function of the primitive state (rho, v, eps)
+        and the pressure (required by odeint, but not used: see note above)
+    """
+    lr_sign = wavenumber - 1
+    p_from_rho_eps = q_known.eos['p_from_rho_eps']
+    h_from_rho_eps = q_known.eos['h_from_rho_eps']
+    cs_from_rho_eps = q_known.eos['cs_from_rho_eps']
+    # As State.vt_from_known, but reusing the local h
+    hWvt_known = q_known.h * q_known.W_lorentz * q_known.vt
+    hWvt_known2 = hWvt_known**2
+
+    def dwdp(w, p):
+        rho, v, eps = w
+        p_local = p_from_rho_eps(rho, eps)
+        h = h_from_rho_eps(rho, eps)
+        cs = cs_from_rho_eps(rho, eps)
+        vt = hWvt_known * numpy.sqrt((1.0 - v**2) / (h**2 + hWvt_known2))
+        W_lorentz2 = 1.0 / (1.0 - v**2 - vt**2)
+        xi = wavespeed_from_v_cs(v, vt, cs, wavenumber)
+        # g quantifies the effect of tangential velocities: see the Living
+        # Review and original Pons et al paper for details.
+        g = vt**2 * (xi**2 - 1.0) / (1.0 - xi * v)**2
+        # d rho / dp = 1 / (h c_s^2) also appears in d eps / dp
+        drhodp = 1.0 / (h * cs**2)
+        return numpy.array([drhodp,
+            lr_sign / (rho * h * W_lorentz2 * cs) / numpy.sqrt(1.0 + g),
+            p_local / rho**2 * drhodp])
+
+    return dwdp
+
+def rarefaction_dwdp(w, p, q_known, wavenumber):
+    r"""
+    Right hand side of the rarefaction ODE at a single point.
+
+    Prefer rarefaction_dwdp_function when integrating, so that the setup is
+    not repeated at every step.
 
     Parameters
     ----------
@@ -29,28 +134,14 @@ def rarefaction_dwdp(w, p, q_known, wavenumber):
     w : tuple
         primitive state (rho, v, eps)
     p : scalar
-        pressure (required by odeint, but not used: see note above)
+        pressure (required by odeint, but not used: see
+        rarefaction_dwdp_function)
     q_known : State
         Known state
     wavenumber : scalar
         Wave number
     """
-    lr_sign = wavenumber - 1
-    dwdp = numpy.zeros_like(w)
-    rho, v, eps = w
-    vt = q_known.vt_from_known(rho, v, eps)
-    local_state = State(rho, v, vt, eps, q_known.eos)
-    cs = local_state.cs
-    h = local_state.h
-    W_lorentz = local_state.W_lorentz
-    xi = local_state.wavespeed(wavenumber)
-    # g quantifies the effect of tangential velocities: see the Living Review
-    # and original Pons et al paper for details.
-    g = vt**2 * (xi**2 - 1.0) / (1.0 - xi * v)**2
-    dwdp[0] = 1.0 / (h * cs**2)
-    dwdp[1] = lr_sign / (rho * h * W_lorentz**2 * cs) / numpy.sqrt(1.0 + g)
-    dwdp[2] = local_state.p / (rho**2 * h * cs**2)
-    return dwdp
+    return rarefaction_dwdp_function(q_known, wavenumber)(w, p)
 
 def mass_flux_squared(q_start, p_end, unknown_eos=None):
     r"""
@@ -72,10 +163,16 @@ def mass_flux_squared(q_start, p_end, unknown_eos=None):
     if unknown_eos is None:
         unknown_eos = q_start.eos
 
+    # shock_root_rho is the root finding callback, so keep the lookups of
+    # the EOS function and known state out of it
+    h_from_rho_p = unknown_eos['h_from_rho_p']
+    h2_start = q_start.h**2
+    h_over_rho_start = q_start.h / q_start.rho
+    dp = p_end - q_start.p
+
     def shock_root_rho(rho):
-        h = unknown_eos['h_from_rho_p'](rho, p_end)
-        return (h**2 - q_start.h**2) - \
-        (h/rho + q_start.h/q_start.rho) * (p_end - q_start.p)
+        h = h_from_rho_p(rho, p_end)
+        return (h**2 - h2_start) - (h/rho + h_over_rho_start) * dp
 
     if p_end >= q_start.p:
         # Shock
@@ -99,12 +196,11 @@ def mass_flux_squared(q_start, p_end, unknown_eos=None):
             max_rho *= 1.001
             shock_root_min = shock_root_rho(min_rho)
             shock_root_max = shock_root_rho(max_rho)
-    rho = brentq(shock_root_rho, min_rho, max_rho)
-    h = unknown_eos['h_from_rho_p'](rho, p_end)
+    rho = brenth(shock_root_rho, min_rho, max_rho)
+    h = h_from_rho_p(rho, p_end)
     eps = h - 1.0 - p_end / rho
-    dp = p_end - q_start.p
-    dh2 = h**2 - q_start.h**2
-    j2 = -dp / (dh2 / dp - 2.0 * q_start.h / q_start.rho)
+    dh2 = h**2 - h2_start
+    j2 = -dp / (dh2 / dp - 2.0 * h_over_rho_start)
 
     return j2, rho, eps, dp
 
@@ -140,24 +236,8 @@ def deflagration_root(p_0_star, q_precursor, unknown_eos, wavenumber, label):
     j2, rho, eps, dp = mass_flux_squared(q_precursor, p_0_star, unknown_eos)
     if j2 < 0:
         return 10.0 # Unphysical part of Crussard curve, return a random number
-    j = numpy.sqrt(j2)
-    v_deflagration = (q_precursor.rho**2 *
-        q_precursor.W_lorentz**2 * q_precursor.v + \
-        lr_sign * j**2 * \
-        numpy.sqrt(1.0 + q_precursor.rho**2 *
-        q_precursor.W_lorentz**2 *
-        (1.0 - q_precursor.v**2) / j**2)) / \
-        (q_precursor.rho**2 * q_precursor.W_lorentz**2 + j**2)
-    W_lorentz_deflagration = 1.0 / numpy.sqrt(1.0 - v_deflagration**2)
-    v = (q_precursor.h * q_precursor.W_lorentz *
-         q_precursor.v + lr_sign * dp *
-         W_lorentz_deflagration / j) / \
-        (q_precursor.h * q_precursor.W_lorentz + dp * (1.0 /
-         q_precursor.rho / q_precursor.W_lorentz + \
-         lr_sign * q_precursor.v *
-         W_lorentz_deflagration / j))
-    vt = q_precursor.vt_from_known(rho, v, eps)
-    q_unknown = State(rho, v, vt, eps, unknown_eos, label)
+    v_deflagration, q_unknown = post_discontinuity_state(p_0_star,
+        q_precursor, lr_sign, label, j2, rho, eps, dp, unknown_eos)
 
     return q_unknown.wavespeed(wavenumber) - v_deflagration
 
@@ -204,6 +284,49 @@ def precursor_root(p_0_star, q_known, wavenumber):
 #       calculate_burning_speed for WaveSection class, which are then
 #       called by its subclasses
 
+def discontinuity_velocities(rho, v, h, W_lorentz, j2, dp, lr_sign):
+    """
+    Give the speed of a discontinuity and the normal velocity behind it.
+
+    This is the jump algebra shared by all discontinuities, written purely
+    in terms of scalars (or arrays) so it involves no States.
+
+    Parameters
+    ----------
+
+    rho : double
+        Rest mass density of the known state
+    v : double
+        Normal velocity of the known state
+    h : double
+        Specific enthalpy of the known state
+    W_lorentz : double
+        Lorentz factor of the known state
+    j2 : double
+        Square of the mass flux across the wave
+    dp : double
+        Jump in pressure across the discontinuity
+    lr_sign : int
+        -1 for a left going wave, +1 for a right going wave
+
+    Returns
+    -------
+
+    v_shock : double
+        Speed of the discontinuity
+    v_end : double
+        Normal velocity on the other side of the discontinuity
+    """
+    j = numpy.sqrt(j2)
+    rhoW2 = rho**2 * W_lorentz**2
+    hW = h * W_lorentz
+    v_shock = (rhoW2 * v + lr_sign * j2 * \
+        numpy.sqrt(1.0 + rhoW2 * (1.0 - v**2) / j2)) / (rhoW2 + j2)
+    W_lorentz_shock = 1.0 / numpy.sqrt(1.0 - v_shock**2)
+    v_end = (hW * v + lr_sign * dp * W_lorentz_shock / j) / \
+        (hW + dp * (1.0 / rho / W_lorentz + lr_sign * v * W_lorentz_shock / j))
+    return v_shock, v_end
+
 def post_discontinuity_state(p_star, q_start, lr_sign, label, j2, rho, eps, dp,
                              eos_end = None):
     """
@@ -243,19 +366,45 @@ def post_discontinuity_state(p_star, q_start, lr_sign, label, j2, rho, eps, dp,
     """
     if eos_end is None:
         eos_end = q_start.eos
-    j = numpy.sqrt(j2)
-    v_shock = (q_start.rho**2 * q_start.W_lorentz**2 * q_start.v + \
-        lr_sign * j**2 * \
-        numpy.sqrt(1.0 + q_start.rho**2 * q_start.W_lorentz**2 * (1.0 - q_start.v**2) / j**2)) / \
-        (q_start.rho**2 * q_start.W_lorentz**2 + j**2)
-    W_lorentz_shock = 1.0 / numpy.sqrt(1.0 - v_shock**2)
-    v = (q_start.h * q_start.W_lorentz * q_start.v + lr_sign * dp * W_lorentz_shock / j) / \
-        (q_start.h * q_start.W_lorentz + dp * (1.0 / q_start.rho / q_start.W_lorentz + \
-        lr_sign * q_start.v * W_lorentz_shock / j))
+    v_shock, v = discontinuity_velocities(q_start.rho, q_start.v, q_start.h,
+                                          q_start.W_lorentz, j2, dp, lr_sign)
     vt = q_start.vt_from_known(rho, v, eps)
     q_end = State(rho, v, vt, eps, eos_end, label=label)
     return v_shock, q_end
 
+def discontinuity_jump(p_end, q_start, lr_sign, label, eos_end=None):
+    """
+    Give the state across a discontinuity from the pressure behind it.
+
+    Finds the mass flux and then the state across the discontinuity; used by
+    shocks, deflagrations and detonations, including the CJ cases.
+
+    Parameters
+    ----------
+
+    p_end : double
+        Post-discontinuity pressure
+    q_start : State
+        Known State
+    lr_sign : int
+        -1 for a left going wave, +1 for a right going wave
+    label : string
+        Optional label of the post-discontinuity State
+    eos_end : EOS
+        Equation of State on the other side of the discontinuity, if different
+
+    Returns
+    -------
+
+    v_shock : double
+        Speed of the discontinuity
+    q_end : State
+        State on the other side of the discontinuity.
+    """
+    j2, rho, eps, dp = mass_flux_squared(q_start, p_end, eos_end)
+    return post_discontinuity_state(p_end, q_start, lr_sign, label, j2, rho,
+                                    eps, dp, eos_end)
+
 class WaveSection(object):
     """
     A wave section is a single type of solution where the State varies.
@@ -287,6 +436,18 @@ class WaveSection(object):
         True if the State does not change across the WaveSection
     """
 
+    # Many sections are built per Riemann Problem (including inside root
+    # finds), so avoid a per-instance __dict__
+    __slots__ = ('trivial', 'wavenumber', 'name', 'q_start', 'q_end',
+                 'wavespeed', 'type')
+
+    # Label of the unknown State and direction suffix of the name, for left
+    # (wavenumber 0) and right (wavenumber 2) going waves
+    _LABEL_L = r"\star_L"
+    _LABEL_R = r"\star_R"
+    _ARROW_L = r"_{\leftarrow}"
+    _ARROW_R = r"_{\rightarrow}"
+
     def __init__(self, q_start, p_end, wavenumber):
         """
         A part of a wave. For a single shock or rarefaction, this will be the
@@ -303,6 +464,14 @@ class WaveSection(object):
         self.wavespeed = []
         self.type = ""
 
+    def _label_and_arrow(self):
+        """
+        Label of the unknown State and direction suffix of the name.
+        """
+        if self.wavenumber == 0:
+            return self._LABEL_L, self._ARROW_L
+        return self._LABEL_R, self._ARROW_R
+
     def latex_string(self):
         """
         Text description of the WaveSection
@@ -317,7 +486,7 @@ class WaveSection(object):
         if self.trivial:
             return ""
         else:
-            s = deepcopy(self.name)
+            s = self.name
             s += r": \lambda^{{({})}}".format(self.wavenumber)
             if len(self.wavespeed) > 1:
                 s += r"\in [{:.4f}, {:.4f}]".format(self.wavespeed[0],
@@ -365,14 +534,16 @@ class Contact(WaveSection):
     for the hydrodynamic case.
     """
 
+    __slots__ = ()
+
     def __init__(self, q_start, q_end, wavenumber):
 
         self.trivial = False
         assert(wavenumber in [1]), "wavenumber for a Contact must be 1"
         self.type = "Contact"
         self.wavenumber = wavenumber
-        self.q_start = deepcopy(q_start)
-        self.q_end = deepcopy(q_end)
+        self.q_start = q_start.clone()
+        self.q_end = q_end.clone()
 
         self.name = r"{\cal C}"
 
@@ -382,55 +553,63 @@ class Contact(WaveSection):
             self.trivial = True
             self.name = ""
 
-        assert(numpy.allclose(q_start.v, q_end.v)), "Velocities of states "\
+        assert(_isclose(q_start.v, q_end.v)), "Velocities of states "\
         "must match for a contact"
-        assert(numpy.allclose(q_start.p, q_end.p)), "Pressures of states "\
+        assert(_isclose(q_start.p, q_end.p)), "Pressures of states "\
         "must match for a contact"
-        assert(numpy.allclose(q_start.wavespeed(wavenumber),
-                              q_end.wavespeed(wavenumber))), "Wavespeeds of "\
+        assert(_isclose(q_start.wavespeed(wavenumber),
+                        q_end.wavespeed(wavenumber))), "Wavespeeds of "\
         "states must match for a contact"
 
 class Rarefaction(WaveSection):
     """
     A continuous wave section across which pressure decreases.
+
+    The optional rtol and atol are the tolerances used when integrating
+    across the rarefaction, and n_points is the number of points at which the
+    solution is kept for plotting. The integration is done once, here, and
+    reused by plotting_data; storing the extra points costs no further
+    evaluations of the ODE.
     """
 
-    def __init__(self, q_start, p_end, wavenumber):
+    __slots__ = ('_w_all',)
+
+    def __init__(self, q_start, p_end, wavenumber, rtol=1e-12, atol=1e-10,
+                 n_points=500):
 
         self.trivial = False
         assert(wavenumber in [0, 2]), "wavenumber for a Rarefaction "\
         "must be in 0, 2"
         assert(q_start.p >= p_end), "For a rarefaction, p_start >= p_end"
+        assert(n_points >= 2), "A rarefaction needs at least 2 points"
         self.type = "Rarefaction"
         self.wavenumber = wavenumber
-        self.q_start = deepcopy(q_start)
+        self.q_start = q_start.clone()
+        self._w_all = None
 
-        self.name = r"{\cal R}"
-        if self.wavenumber == 0:
-            label = r"\star_L"
-            self.name += r"_{\leftarrow}"
-        else:
-            label = r"\star_R"
-            self.name += r"_{\rightarrow}"
+        label, arrow = self._label_and_arrow()
+        self.name = r"{\cal R}" + arrow
 
         v_known = q_start.wavespeed(self.wavenumber)
 
         self.wavespeed = []
 
-        if numpy.allclose(q_start.p, p_end):
+        if _isclose(q_start.p, p_end):
             self.trivial = True
             self.q_end = State(q_start.rho, q_start.v, q_start.vt, q_start.eps,
             q_start.eos, label=label)
             v_unknown = v_known
             self.name = ""
         else:
-            w_all = odeint(rarefaction_dwdp,
-                           numpy.array([q_start.rho, q_start.v, q_start.eps]),
-                           [q_start.p, p_end], rtol = 1e-12, atol = 1e-10,
-                           args=((q_start, self.wavenumber)))
-            self.q_end = State(w_all[-1, 0], w_all[-1, 1],
-                              q_start.vt_from_known(w_all[-1, 0], w_all[-1, 1], w_all[-1, 2]),
-                              w_all[-1, 2], q_start.eos, label=label)
+            self._w_all = odeint(
+                rarefaction_dwdp_function(q_start, self.wavenumber),
+                numpy.array([q_start.rho, q_start.v, q_start.eps]),
+                numpy.linspace(q_start.p, p_end, n_points), rtol = rtol,
+                atol = atol)
+            w_end = self._w_all[-1]
+            self.q_end = State(w_end[0], w_end[1],
+                              q_start.vt_from_known(w_end[0], w_end[1], w_end[2]),
+                              w_end[2], q_start.eos, label=label)
             v_unknown = self.q_end.wavespeed(self.wavenumber)
             if self.wavenumber == 0:
                 self.wavespeed = numpy.array([v_known, v_unknown])
@@ -438,25 +617,28 @@ class Rarefaction(WaveSection):
                 self.wavespeed = numpy.array([v_unknown, v_known])
 
     def plotting_data(self):
-        # TODO: make the number of points in the rarefaction plot a parameter
         if self.trivial:
             xi = numpy.zeros((0,))
             data = numpy.zeros((0,8))
         else:
-            p = numpy.linspace(self.q_start.p, self.q_end.p, 500)
-            w_all = odeint(rarefaction_dwdp,
-                           numpy.array([self.q_start.rho,
-                               self.q_start.v, self.q_start.eps]),
-                               p, rtol = 1e-12, atol = 1e-10,
-                               args=(self.q_start, self.wavenumber))
-            data = numpy.zeros((len(p),8))
-            xi = numpy.zeros_like(p)
-            for i in range(len(p)):
-                state = State(w_all[i,0], w_all[i,1],
-                              self.q_start.vt_from_known(w_all[i,0], w_all[i,1], w_all[i,2]),
-                              w_all[i, 2], self.q_start.eos)
-                xi[i] = state.wavespeed(self.wavenumber)
-                data[i,:] = state.state()
+            # A single State holding arrays evaluates every point at once.
+            # The EOS functions are only required to accept scalars, so fall
+            # back to one State per point if they do not broadcast.
+            rho, v, eps = self._w_all.T
+            try:
+                states = State(rho, v, self.q_start.vt_from_known(rho, v, eps),
+                               eps, self.q_start.eos)
+                xi = states.wavespeed(self.wavenumber)
+                data = states.state().T
+            except (TypeError, ValueError):
+                xi = numpy.zeros_like(rho)
+                data = numpy.zeros((len(rho), 8))
+                for i, w in enumerate(self._w_all):
+                    q = State(w[0], w[1],
+                              self.q_start.vt_from_known(w[0], w[1], w[2]),
+                              w[2], self.q_start.eos)
+                    xi[i] = q.wavespeed(self.wavenumber)
+                    data[i, :] = q.state()
 
         return xi, data
 
@@ -465,6 +647,8 @@ class Shock(WaveSection):
     A discontinuous wave section across which pressure increases.
     """
 
+    __slots__ = ()
+
     def __init__(self, q_start, p_end, wavenumber):
 
         self.trivial = False
@@ -476,27 +660,20 @@ class Shock(WaveSection):
         self.type = "Shock"
         self.wavenumber = wavenumber
         lr_sign = self.wavenumber - 1
-        self.q_start = deepcopy(q_start)
+        self.q_start = q_start.clone()
 
-        self.name = r"{\cal S}"
-        if self.wavenumber == 0:
-            label = r"\star_L"
-            self.name += r"_{\leftarrow}"
-        else:
-            label = r"\star_R"
-            self.name += r"_{\rightarrow}"
+        label, arrow = self._label_and_arrow()
+        self.name = r"{\cal S}" + arrow
 
-        if numpy.allclose(q_start.p, p_end):
+        if _isclose(q_start.p, p_end):
             self.trivial = True
             self.q_end = State(q_start.rho, q_start.v, q_start.vt, q_start.eps,
             q_start.eos, label=label)
             v_shock = q_start.wavespeed(self.wavenumber)
             self.name = ""
         else:
-            j2, rho, eps, dp = mass_flux_squared(q_start, p_end,
-                                                 q_start.eos)
-            v_shock, self.q_end = post_discontinuity_state(p_end,
-                q_start, lr_sign, label, j2, rho, eps, dp)
+            v_shock, self.q_end = discontinuity_jump(p_end, q_start,
+                                                     lr_sign, label)
 
         self.wavespeed = [v_shock]
 
@@ -507,15 +684,17 @@ class Deflagration(WaveSection):
     takes place.
     """
 
+    __slots__ = ()
+
     def __init__(self, q_start, p_end, wavenumber):
 
         eos_end = q_start.eos['eos_inert']
-        t_i = q_start.eos['t_ignition'](q_start.rho, q_start.eps)
 
         self.trivial = False
         assert(wavenumber in [0, 2]), "wavenumber for a Deflagration "\
         "must be in 0, 2"
         assert(q_start.p >= p_end), "For a deflagration, p_start >= p_end"
+#        t_i = q_start.eos['t_ignition'](q_start.rho, q_start.eps)
 #        t_start = q_start.eos['t_from_rho_eps'](q_start.rho, q_start.eps)
 #        assert(t_start >= t_i), "For a deflagration, temperature of start "\
 #        "state must be at least the ignition temperature"
@@ -524,19 +703,14 @@ class Deflagration(WaveSection):
         self.type = "Deflagration"
         self.wavenumber = wavenumber
         lr_sign = self.wavenumber - 1
-        self.q_start = deepcopy(q_start)
+        self.q_start = q_start.clone()
 
-        self.name = r"{\cal WDF}"
-        if self.wavenumber == 0:
-            label = r"\star_L"
-            self.name += r"_{\leftarrow}"
-        else:
-            label = r"\star_R"
-            self.name += r"_{\rightarrow}"
+        label, arrow = self._label_and_arrow()
+        self.name = r"{\cal WDF}" + arrow
 
         v_known = q_start.wavespeed(self.wavenumber)
 
-        if numpy.allclose(q_start.p, p_end):
+        if _isclose(q_start.p, p_end):
             self.trivial = True
             self.q_end = State(q_start.rho, q_start.v, q_start.vt, q_start.eps,
             eos_end, label=label)
@@ -545,31 +719,21 @@ class Deflagration(WaveSection):
         else:
             # This is a single deflagration, so the start state must be at the
             # reaction temperature already.
-            j2, rho, eps, dp = mass_flux_squared(q_start, p_end, eos_end)
-            v_deflagration, q_unknown = post_discontinuity_state(
-                p_end, q_start, lr_sign, label, j2, rho, eps, dp,
-                eos_end)
+            v_deflagration, q_unknown = discontinuity_jump(p_end, q_start,
+                lr_sign, label, eos_end)
 
             # If the speed in the unknown state means the characteristics are
             # not going into the deflagration, then this is an unstable strong
             # deflagration
             if (lr_sign*(q_unknown.wavespeed(self.wavenumber) - v_deflagration) < 0):
-                p_cjdf = brentq(deflagration_root, (1.0+1e-9)*p_end,
+                p_cjdf = brenth(deflagration_root, (1.0+1e-9)*p_end,
                                 (1.0-1e-9)*q_start.p,
                                 args=(q_start, eos_end, self.wavenumber, label))
-                j2, rho, eps, dp = mass_flux_squared(q_start, p_cjdf, eos_end)
-                v_deflagration, q_unknown = post_discontinuity_state(
-                    p_cjdf, q_start, lr_sign, label, j2, rho, eps,
-                    dp, eos_end)
-                self.name = r"{\cal CJDF}"
-                if self.wavenumber == 0:
-                    label = r"\star_L"
-                    self.name += r"_{\leftarrow}"
-                else:
-                    label = r"\star_R"
-                    self.name += r"_{\rightarrow}"
-
-            self.q_end = deepcopy(q_unknown)
+                v_deflagration, q_unknown = discontinuity_jump(p_cjdf,
+                    q_start, lr_sign, label, eos_end)
+                self.name = r"{\cal CJDF}" + arrow
+
+            self.q_end = q_unknown.clone()
 
         if q_start.cs - self.q_end.cs < 0:
             raise UnphysicalSolution("There is no physical solution")
@@ -582,34 +746,31 @@ class Detonation(WaveSection):
     takes place.
     """
 
+    __slots__ = ()
+
     def __init__(self, q_start, p_end, wavenumber):
 
         eos_end = q_start.eos['eos_inert']
-        t_i = q_start.eos['t_ignition'](q_start.rho, q_start.eps)
 
         self.trivial = False
         assert(wavenumber in [0, 2]), "wavenumber for a Detonation "\
         "must be in 0, 2"
         assert(q_start.p <= p_end), "For a detonation, p_start <= p_end"
+        #t_i = q_start.eos['t_ignition'](q_start.rho, q_start.eps)
         #t_start = q_start.eos['t_from_rho_eps'](q_start.rho, q_start.eps)
         #assert(t_start >= t_i), "For a detonation, temperature of start "\
         #"state must be at least the ignition temperature"
         self.type = "Detonation"
         self.wavenumber = wavenumber
         lr_sign = self.wavenumber - 1
-        self.q_start = deepcopy(q_start)
+        self.q_start = q_start.clone()
 
-        self.name = r"{\cal SDT}"
-        if self.wavenumber == 0:
-            label = r"\star_L"
-            self.name += r"_{\leftarrow}"
-        else:
-            label = r"\star_R"
-            self.name += r"_{\rightarrow}"
+        label, arrow = self._label_and_arrow()
+        self.name = r"{\cal SDT}" + arrow
 
         v_known = q_start.wavespeed(self.wavenumber)
 
-        if numpy.allclose(q_start.p, p_end):
+        if _isclose(q_start.p, p_end):
             self.trivial = True
             self.q_end = State(q_start.rho, q_start.v, q_start.vt, q_start.eps,
             eos_end, label=label)
@@ -624,7 +785,7 @@ class Detonation(WaveSection):
                 # detonation. So skip the calculation and make sure the CJ
                 # calculation runs
 #                print("Should be a CJ detonation")
-                q_unknown = deepcopy(q_start)
+                q_unknown = q_start.clone()
                 v_detonation = q_unknown.wavespeed(self.wavenumber) + lr_sign
             else:
                 v_detonation, q_unknown = post_discontinuity_state(
@@ -637,30 +798,24 @@ class Detonation(WaveSection):
             if (lr_sign*(q_unknown.wavespeed(self.wavenumber) - v_detonation) < 0):
                 pmin = (1.0+1e-9)*min(q_start.p, p_end)
                 pmax = max(q_start.p, p_end)
-                fmin = deflagration_root(pmin, q_start, eos_end, self.wavenumber, label)
-                fmax = deflagration_root(pmax, q_start, eos_end, self.wavenumber, label)
+                cj_residual = _memoize_root(deflagration_root, q_start,
+                                            eos_end, self.wavenumber, label)
+                fmin = cj_residual(pmin)
+                fmax = cj_residual(pmax)
                 while fmin * fmax > 0:
                     pmax *= 2.0
-                    fmax = deflagration_root(pmax, q_start, eos_end, self.wavenumber, label)
-                p_cjdt = brentq(deflagration_root, pmin, pmax,
-                                args=(q_start, eos_end, self.wavenumber, label))
-                j2, rho, eps, dp = mass_flux_squared(q_start, p_cjdt, eos_end)
-                v_detonation, q_unknown = post_discontinuity_state(
-                    p_cjdt, q_start, lr_sign, label, j2, rho,
-                    eps, dp, eos_end)
-                self.name = r"{\cal CJDT}"
-                if self.wavenumber == 0:
-                    label = r"\star_L"
-                    self.name += r"_{\leftarrow}"
-                else:
-                    label = r"\star_R"
-                    self.name += r"_{\rightarrow}"
-
-            self.q_end = deepcopy(q_unknown)
+                    fmax = cj_residual(pmax)
+                p_cjdt = brenth(cj_residual, pmin, pmax)
+                v_detonation, q_unknown = discontinuity_jump(p_cjdt,
+                    q_start, lr_sign, label, eos_end)
+                self.name = r"{\cal CJDT}" + arrow
+
+            self.q_end = q_unknown.clone()
 
         self.wavespeed = numpy.array([v_detonation])
 
-def build_inert_wave_section(q_known, unknown_value, wavenumber):
+def build_inert_wave_section(q_known, unknown_value, wavenumber, rtol=1e-12,
+                             atol=1e-10, n_points=500):
     """
     Object factory for the WaveSection; non-reactive case
 
@@ -673,6 +828,10 @@ def build_inert_wave_section(q_known, unknown_value, wavenumber):
         Pressure in the region of unknown state
     wavenumber : scalar
         Characterises direction of travel of wave
+    rtol, atol : scalar, optional
+        Tolerances for integrating across any Rarefaction
+    n_points : int, optional
+        Number of points kept across any Rarefaction for plotting
 
     Returns
     -------
@@ -686,9 +845,11 @@ def build_inert_wave_section(q_known, unknown_value, wavenumber):
     elif q_known.p < unknown_value:
         return [Shock(q_known, unknown_value, wavenumber)]
     else:
-        return [Rarefaction(q_known, unknown_value, wavenumber)]
+        return [Rarefaction(q_known, unknown_value, wavenumber, rtol=rtol,
+                            atol=atol, n_points=n_points)]
 
-def build_reactive_wave_section(q_known, unknown_value, wavenumber):
+def build_reactive_wave_section(q_known, unknown_value, wavenumber, rtol=1e-12,
+                                atol=1e-10, n_points=500):
     """
     Object factory for the WaveSection; reactive case
 
@@ -701,6 +862,10 @@ def build_reactive_wave_section(q_known, unknown_value, wavenumber):
         Pressure in the region of unknown state
     wavenumber : scalar
         Characterises direction of travel of wave
+    rtol, atol : scalar, optional
+        Tolerances for integrating across any Rarefaction
+    n_points : int, optional
+        Number of points kept across any Rarefaction for plotting
 
     Returns
     -------
@@ -709,8 +874,6 @@ def build_reactive_wave_section(q_known, unknown_value, wavenumber):
         List of WaveSections
     """
 
-    t_i = q_known.eos['t_ignition'](q_known.rho, q_known.eps)
-
     if wavenumber == 1:
         return Contact(q_known, unknown_value, wavenumber)
     else:
@@ -719,10 +882,12 @@ def build_reactive_wave_section(q_known, unknown_value, wavenumber):
             # The detonation wave
             detonation = Detonation(q_known, unknown_value, wavenumber)
             wavesections.append(detonation)
-            q_next = deepcopy(detonation.q_end)
+            q_next = detonation.q_end.clone()
             # Finally, was it a CJ detonation?
             if q_next.p > unknown_value:
-                rarefaction = Rarefaction(q_next, unknown_value, wavenumber)
+                rarefaction = Rarefaction(q_next, unknown_value, wavenumber,
+                                          rtol=rtol, atol=atol,
+                                          n_points=n_points)
                 wavesections.append(rarefaction)
         else:
             t_known = q_known.eos['t_from_rho_eps'](q_known.rho, q_known.eps)
@@ -730,30 +895,32 @@ def build_reactive_wave_section(q_known, unknown_value, wavenumber):
             if t_known < t_i: # Need a precursor shock
                 p_min = unknown_value
                 p_max = q_known.p
-                t_min = precursor_root(p_min, q_known, wavenumber)
-                t_max = precursor_root(p_max, q_known, wavenumber)
+                t_residual = _memoize_root(precursor_root, q_known, wavenumber)
+                t_min = t_residual(p_min)
+                t_max = t_residual(p_max)
                 assert(t_min < 0)
 
                 if t_max <= 0:
                     p_max *= 2
-                    t_max = precursor_root(p_max, q_known, wavenumber)
+                    t_max = t_residual(p_max)
 
-                p_0_star = brentq(precursor_root, p_min, p_max,
-                                  args=(q_known, wavenumber))
+                p_0_star = brenth(t_residual, p_min, p_max)
                 precursor_shock = Shock(q_known, p_0_star, wavenumber)
                 wavesections.append(precursor_shock)
                 q_next = precursor_shock.q_end
                 q_next.q = q_known.q # No reaction across inert precursor
                 q_next.eos = q_known.eos
             else: # No precursor shock
-                q_next = deepcopy(q_known)
+                q_next = q_known.clone()
             # Next, the deflagration wave
             deflagration = Deflagration(q_next, unknown_value, wavenumber)
             wavesections.append(deflagration)
-            q_next = deepcopy(deflagration.q_end)
+            q_next = deflagration.q_end.clone()
             # Finally, was it a CJ deflagration?
             if q_next.p > unknown_value:
-                rarefaction = Rarefaction(q_next, unknown_value, wavenumber)
+                rarefaction = Rarefaction(q_next, unknown_value, wavenumber,
+                                          rtol=rtol, atol=atol,
+                                          n_points=n_points)
                 wavesections.append(rarefaction)
 
         return wavesections
@@ -781,6 +948,10 @@ class Wave(object):
         Pressure in the region of unknown state
     wavenumber : scalar
         characterises direction of travel of wave
+    rtol, atol : scalar, optional
+        Tolerances for integrating across any Rarefaction
+    n_points : int, optional
+        Number of points kept across any Rarefaction for plotting
 
     Attributes
     ----------
@@ -801,59 +972,54 @@ class Wave(object):
         True if the State does not change across the Wave
     """
 
-    def __init__(self, q_known, unknown_value, wavenumber):
+    __slots__ = ('wavenumber', 'wave_sections', 'wavespeed', 'name', 'q_l',
+                 'q_r', 'trivial')
+
+    def __init__(self, q_known, unknown_value, wavenumber, rtol=1e-12,
+                 atol=1e-10, n_points=500):
 
         # NOTE: it's not so clear what wavenumber is - change to something like a wavedirection variable which can be left/right/static?
         self.wavenumber = wavenumber
-        self.wave_sections = []
         self.wavespeed = []
 
         if 'q_available' not in q_known.eos:
             waves = build_inert_wave_section(q_known, unknown_value,
-                                             wavenumber)
-            for sections in waves:
-                self.wave_sections.append(sections)
+                                             wavenumber, rtol=rtol, atol=atol,
+                                             n_points=n_points)
         else:
             waves = build_reactive_wave_section(q_known, unknown_value,
-                                                wavenumber)
-            for sections in waves:
-                self.wave_sections.append(sections)
+                                                wavenumber, rtol=rtol,
+                                                atol=atol, n_points=n_points)
+        self.wave_sections = list(waves)
 
         self.name = self.wave_sections_latex_string()
         if wavenumber == 0:
-            self.q_l = deepcopy(q_known)
+            self.q_l = q_known.clone()
             if self.wave_sections:
                 self.q_r = self.wave_sections[-1].q_end
             else:
-                self.q_r = deepcopy(self.q_l)
+                self.q_r = self.q_l.clone()
         elif wavenumber == 1:
-            self.q_l = deepcopy(q_known)
-            self.q_r = deepcopy(q_known)
+            self.q_l = q_known.clone()
+            self.q_r = q_known.clone()
         else:
-            self.q_r = deepcopy(q_known)
+            self.q_r = q_known.clone()
             if self.wave_sections:
                 self.q_l = self.wave_sections[-1].q_end
             else:
-                self.q_l = deepcopy(self.q_r)
-
-        minspeed = 10
-        maxspeed = -10
-        if self.wave_sections:
-            for wavesection in self.wave_sections:
-                for speed in wavesection.wavespeed:
-                    minspeed = min(speed, minspeed)
-                    maxspeed = max(speed, maxspeed)
-        self.wavespeed.append(minspeed)
-        if not numpy.allclose(minspeed, maxspeed):
-            self.wavespeed.append(maxspeed)
-
-        self.trivial = True
-        if self.wave_sections:
-            for wavesection in self.wave_sections:
-                if not wavesection.trivial:
-                    self.trivial = False
-        if self.trivial:
-            self.wavespeed = []
+                self.q_l = self.q_r.clone()
+
+        # A trivial wave has no speeds, so only reduce them when needed
+        self.trivial = all(wavesection.trivial
+                           for wavesection in self.wave_sections)
+        if not self.trivial:
+            speeds = numpy.concatenate([numpy.atleast_1d(wavesection.wavespeed)
+                                        for wavesection in self.wave_sections])
+            minspeed = speeds.min()
+            maxspeed = speeds.max()
+            self.wavespeed.append(minspeed)
+            if not _isclose(minspeed, maxspeed):
+                self.wavespeed.append(maxspeed)
 
     def plotting_data(self):
         r"""
@@ -868,12 +1034,14 @@ class Wave(object):
             Data (:math:`\rho, v_x, v_t, \epsilon, p, W, h, c_s`) at each point
         """
 
-        xi_wave = numpy.zeros((0,))
-        data_wave = numpy.zeros((0,8))
+        xi_sections = [numpy.zeros((0,))]
+        data_sections = [numpy.zeros((0,8))]
         for wavesection in self.wave_sections:
             xi_section, data_section = wavesection.plotting_data()
-            xi_wave = numpy.hstack((xi_wave, xi_section))
-            data_wave = numpy.vstack((data_wave, data_section))
+            xi_sections.append(xi_section)
+            data_sections.append(data_section)
+        xi_wave = numpy.concatenate(xi_sections)
+        data_wave = numpy.vstack(data_sections)
 
         if self.wavenumber == 2:
             xi_wave = xi_wave[-1::-1]
@@ -892,7 +1060,7 @@ class Wave(object):
             Description of the type and direction of each WaveSection
         """
         names = []
-        sections = deepcopy(self.wave_sections)
+        sections = list(self.wave_sections)
         if self.wavenumber == 2:
             sections.reverse()
         for sec in sections:
@@ -922,7 +1090,7 @@ class Wave(object):
 
         s = self.wave_sections_latex_string()
         speeds = []
-        sections = deepcopy(self.wave_sections)
+        sections = list(self.wave_sections)
         if self.wavenumber == 2:
             sections.reverse()
         for sec in sections:
@@ -59,3 +59,15 @@ def test_eos_polytrope_law_cold():
     h_from_rho_p = eos['h_from_rho_p'](rho, p)
     # TODO: fix this
     #assert_allclose(h, h_from_rho_p, rtol=1.e-8)
+
+def test_eos_polytrope_law_arrays():
+    """
+    Polytrope law evaluated on arrays straddling rho_transition
+    """
+    eos = eos_defns.eos_polytrope_law([5.0/3.0, 7.0/5.0], 7.0/5.0, 0.5, [1.0, 1.0])
+    rho = numpy.array([0.25, 1.0])
+    eps = numpy.array([2.0, 2.0])
+    for name in ['p_from_rho_eps', 'h_from_rho_eps', 'cs_from_rho_eps']:
+        values = eos[name](rho, eps)
+        assert_allclose(values, [eos[name](rho[i], eps[i]) for i in range(2)],
+                        rtol=1.e-12)
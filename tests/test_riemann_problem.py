@@ -203,3 +203,49 @@ def test_trivial():
     for wave in rp.waves:
         assert(wave.wave_sections[0].trivial)
         assert(wave.name == "")
+
+def test_rarefaction_plotting_data():
+    """
+    The rarefaction plotting data joins the known and star states.
+    """
+    eos = eos_defns.eos_gamma_law(5.0/3.0)
+    w_left = State(1.0, 0.0, 0.0, 1.5, eos, label="L")
+    w_right = State(0.125, 0.0, 0.0, 1.2, eos, label="R")
+    rp = RiemannProblem(w_left, w_right)
+    xi, data = rp.waves[0].plotting_data()
+    assert data.shape == (len(xi), 8)
+    assert_allclose(xi[[0, -1]], rp.waves[0].wavespeed, rtol=1e-6)
+    assert_allclose(data[0], w_left.state(), rtol=1e-6)
+    assert_allclose(data[-1], rp.state_star_l.state(), rtol=1e-6)
+
+def test_rarefaction_plotting_data_scalar_eos():
+    """
+    An EOS whose functions only accept scalars can still be plotted.
+    """
+    import math
+    eos = dict(eos_defns.eos_gamma_law(5.0/3.0))
+    eos['cs_from_rho_eps'] = lambda rho, eps: \
+        math.sqrt(5.0/3.0 * eos['p_from_rho_eps'](rho, eps) /
+                  (rho * eos['h_from_rho_eps'](rho, eps)))
+    w_left = State(1.0, 0.0, 0.0, 1.5, eos, label="L")
+    w_right = State(0.125, 0.0, 0.0, 1.2, eos, label="R")
+    rp = RiemannProblem(w_left, w_right)
+    xi, data = rp.waves[0].plotting_data()
+    assert data.shape == (len(xi), 8)
+    assert_allclose(data[0], w_left.state(), rtol=1e-6)
+    assert_allclose(data[-1], rp.state_star_l.state(), rtol=1e-6)
+
+def test_rarefaction_options():
+    """
+    Rarefaction tolerances and plotting points can be set on the problem.
+    """
+    eos = eos_defns.eos_gamma_law(5.0/3.0)
+    w_left = State(1.0, 0.0, 0.0, 1.5, eos, label="L")
+    w_right = State(0.125, 0.0, 0.0, 1.2, eos, label="R")
+    rp = RiemannProblem(w_left, w_right)
+    rp_loose = RiemannProblem(w_left, w_right, rtol=1e-8, atol=1e-8,
+                              n_points=50)
+    xi, data = rp_loose.waves[0].plotting_data()
+    assert data.shape == (50, 8)
+    assert_allclose(rp_loose.p_star, rp.p_star, rtol=1e-6)
+    assert_allclose(data[-1], rp.state_star_l.state(), rtol=1e-6)
@@ -33,3 +33,21 @@ def test_reactive_state():
     string = r"\begin{pmatrix} \rho \\ v_x \\ v_t \\ \epsilon \\ q \end{pmatrix}_{Test}"
     string += r" = \begin{pmatrix} 1.0000 \\ 0.0000 \\ 0.0000 \\ 1.5000 \\ 1.0000 \end{pmatrix}"
     assert U.latex_string() == string
+
+def test_clone_state():
+    """
+    Cloning gives an independent State sharing the equation of state.
+    """
+
+    eos = eos_defns.eos_gamma_law(5.0/3.0)
+    U = State(1.0, 0.1, 0.2, 1.5, eos, label="Test")
+    ws = U.wavespeed(0)
+    V = U.clone()
+    assert V is not U
+    assert V.eos is U.eos
+    assert V.label == U.label
+    assert_allclose(V.state(), U.state())
+    assert_allclose(V.wavespeed(0), ws)
+    assert_allclose(V.wavespeed(2), U.wavespeed(2))
+    V.rho = 2.0
+    assert_allclose(U.rho, 1.0)